@@ -680,7 +680,7 @@ class Config(object):
             elif t0 == T_SOURCE:
                 kconfig_file = tokens.get_next()
                 exp_kconfig_file = self._expand_sym_refs(kconfig_file)
-                g = glob.glob(self.base_dir + exp_kconfig_file)
+                g = sorted(glob.glob(self.base_dir + exp_kconfig_file))
                 for s in g:
                     f = os.path.join(s)
                     if not os.path.exists(f):
@@ -818,11 +818,12 @@ class Config(object):
             return (val, None)
 
         # In case the symbol is defined in multiple locations, we need to
-        # remember what prompts, defaults, and selects are new for this
-        # definition, as "depends on" should only apply to the local
+        # remember what prompts, defaults, ranges, and selects are new for
+        # this definition, as "depends on" should only apply to the local
         # definition.
         new_prompt = None
         new_def_exprs = []
+        new_ranges = []
         new_selects = []
 
         # Dependencies from 'depends on' statements
@@ -932,11 +933,11 @@ class Config(object):
                 stmt.referenced_syms.add(high)
 
                 if tokens.check(T_IF):
-                    stmt.ranges.append((low, high,
-                                        self._parse_expr(tokens, stmt, line,
-                                                         filename, linenr)))
+                    new_ranges.append((low, high,
+                                       self._parse_expr(tokens, stmt, line,
+                                                        filename, linenr)))
                 else:
-                    stmt.ranges.append((low, high, None))
+                    new_ranges.append((low, high, None))
 
             elif t0 == T_DEF_TRISTATE:
                 stmt.type = TRISTATE
@@ -1070,6 +1071,17 @@ class Config(object):
             stmt.def_exprs.extend([(val_expr, _make_and(cond_expr, deps))
                                    for val_expr, cond_expr in new_def_exprs])
 
+            # Propagate dependencies to ranges, like the C implementation
+            # does, so a range from another definition doesn't apply
+
+            # Only symbols have ranges
+            if isinstance(stmt, Symbol):
+                stmt.ranges.extend([(low, high,
+                                     _make_and(_make_and(cond_expr,
+                                                         depends_on_expr),
+                                               deps))
+                                    for low, high, cond_expr in new_ranges])
+
             # Propagate dependencies to selects
 
             # Only symbols can select
@@ -1,62 +1,160 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 #
 #  Corey Goldberg, Dec 2012
 #
 
-import os
-import sys
-import xml.etree.ElementTree as ET
+"""Merge multiple JUnit XML files into a single results file.
 
+Every input may hold any number of test suites. Suites with the same name
+are merged into one, and a testcase which shows up more than once (the same
+classname, e.g. re-run in a later shard) is only kept from the last file
+it appears in. Inputs are stream-parsed twice and the output is written
+incrementally, so the size of the inputs doesn't matter.
 
-"""Merge multiple JUnit XML files into a single results file.
-Output dumps to sdtdout.
+Output dumps to stdout unless -o is given.
 example usage:
-    $ python merge_junit_results.py results1.xml results2.xml > results.xml
+    $ python3 merge_junit.py results1.xml results2.xml > results.xml
 """
 
+import argparse
+import shutil
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from xml.sax.saxutils import quoteattr
+
+# Sanitycheck reports these failures as errors in the suite totals
+ERROR_REASONS = ["build_error", "qemu_crash"]
+
+
+def testcase_key(testcase):
+    return testcase.get('classname') or testcase.get('name')
+
+
+def testcase_status(testcase):
+    if testcase.find('error') is not None:
+        return 'errors'
+    failure = testcase.find('failure')
+    if failure is not None:
+        if failure.get('message') in ERROR_REASONS:
+            return 'errors'
+        return 'failures'
+    if testcase.find('skipped') is not None:
+        return 'skip'
+    return None
+
+
+def iter_results(file_name):
+    """Stream the test suites and testcases of a file
+
+    @return Generator of (suite element, testcase element) for every
+        testcase, and of (suite element, None) once a suite is complete.
+        The suite element only has its attributes. Elements are cleared
+        once the consumer is done with them.
+    """
+    suite = ET.Element('testsuite')
+    for event, elem in ET.iterparse(file_name, events=('start', 'end')):
+        if elem.tag == 'testsuite':
+            if event == 'start':
+                suite = elem
+            else:
+                yield suite, None
+                elem.clear()
+        elif elem.tag == 'testcase' and event == 'end':
+            yield suite, elem
+            elem.clear()
+            if elem in suite:
+                suite.remove(elem)
+
+
+def new_totals():
+    return {'tests': 0, 'failures': 0, 'errors': 0, 'skip': 0, 'time': 0.0}
+
+
+def index_results(xml_files):
+    """First pass, find where the last result of each testcase is
+
+    @return Tuple of a dictionary mapping the (file index, position) of the
+        testcases kept to their suite name, and an ordered dictionary of
+        the totals of every suite
+    """
+    last = {}
+    totals = OrderedDict()
+    for index, file_name in enumerate(xml_files):
+        position = 0
+        for suite, testcase in iter_results(file_name):
+            name = suite.get('name', '')
+            if name not in totals:
+                totals[name] = new_totals()
+            if testcase is None:
+                totals[name]['time'] += float(suite.get('time', 0))
+                continue
+            last[testcase_key(testcase)] = ((index, position), name,
+                                            testcase_status(testcase))
+            position += 1
+
+    kept = {}
+    for location, name, status in last.values():
+        kept[location] = name
+        totals[name]['tests'] += 1
+        if status:
+            totals[name][status] += 1
+    return kept, totals
+
+
+def merge_results(xml_files, output):
+    kept, totals = index_results(xml_files)
+
+    # Second pass, spool the testcases kept by suite so every suite can be
+    # written in one piece with its totals
+    spools = {name: tempfile.TemporaryFile('w+t', encoding='utf-8')
+              for name in totals}
+    for index, file_name in enumerate(xml_files):
+        position = 0
+        for suite, testcase in iter_results(file_name):
+            if testcase is None:
+                continue
+            name = kept.get((index, position))
+            if name is not None:
+                testcase.tail = None
+                spools[name].write(ET.tostring(testcase, encoding='unicode'))
+            position += 1
+
+    output.write('<?xml version="1.0" encoding="utf-8"?>\n')
+    output.write('<testsuites failures="%d" tests="%d" errors="%d" '
+                 'time="%s">' %
+                 (sum(t['failures'] for t in totals.values()),
+                  sum(t['tests'] for t in totals.values()),
+                  sum(t['errors'] for t in totals.values()),
+                  sum(t['time'] for t in totals.values())))
+    for name, t in totals.items():
+        output.write('<testsuite name=%s time="%s" tests="%d" failures="%d" '
+                     'errors="%d" skip="%d">' %
+                     (quoteattr(name), t['time'], t['tests'], t['failures'],
+                      t['errors'], t['skip']))
+        spools[name].seek(0)
+        shutil.copyfileobj(spools[name], output)
+        spools[name].close()
+        output.write('</testsuite>')
+    output.write('</testsuites>\n')
+
 
 def main():
-    args = sys.argv[1:]
-    if not args:
-        usage()
-        sys.exit(2)
-    if '-h' in args or '--help' in args:
-        usage()
-        sys.exit(2)
-    merge_results(args[:])
-
-
-def merge_results(xml_files):
-    failures = 0
-    tests = 0
-    errors = 0
-    time = 0.0
-    suites = []
-
-    for file_name in xml_files:
-        tree = ET.parse(file_name)
-        test_suites = tree.getroot()
-        test_suite = tree.findall('testsuite')[0];
-        failures += int(test_suite.attrib['failures'])
-        tests += int(test_suite.attrib['tests'])
-        errors += int(test_suite.attrib['errors'])
-        time += float(test_suite.attrib['time'])
-        suites.append(test_suite)
-
-    new_root = ET.Element('testsuites')
-    new_root.attrib['failures'] = '%s' % failures
-    new_root.attrib['tests'] = '%s' % tests
-    new_root.attrib['errors'] = '%s' % errors
-    new_root.attrib['time'] = '%s' % time
-    for suite in suites:
-        new_root.append(suite)
-    new_tree = ET.ElementTree(new_root)
-    ET.dump(new_tree)
-
-
-def usage():
-    this_file = os.path.basename(__file__)
-    print 'Usage:  %s results1.xml results2.xml' % this_file
+    parser = argparse.ArgumentParser(
+        description="Merge multiple JUnit XML files into a single results "
+                    "file.")
+    parser.add_argument('-o', '--output',
+                        help="File to write the merged results to, default "
+                             "is stdout.")
+    parser.add_argument('files', nargs='+', metavar='results.xml')
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            merge_results(args.files, output)
+    else:
+        merge_results(args.files, sys.stdout)
 
 
 if __name__ == '__main__':
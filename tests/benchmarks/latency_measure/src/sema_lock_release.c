@@ -17,6 +17,7 @@
 
 #include "timestamp.h"
 #include "utils.h"
+#include <tc_util.h>
 
 #include <arch/cpu.h>
 
@@ -58,6 +59,7 @@ int sema_lock_unlock(void)
 			     timestamp / N_TEST_SEMA,
 			     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
 							   N_TEST_SEMA));
+		TC_METRIC("sema_give", timestamp / N_TEST_SEMA, "cycles");
 	} else {
 		error_count++;
 		PRINT_OVERFLOW_ERROR();
@@ -75,6 +77,7 @@ int sema_lock_unlock(void)
 			     timestamp / N_TEST_SEMA,
 			     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
 							   N_TEST_SEMA));
+		TC_METRIC("sema_take", timestamp / N_TEST_SEMA, "cycles");
 	} else {
 		error_count++;
 		PRINT_OVERFLOW_ERROR();
@@ -105,6 +108,7 @@ int mutex_lock_unlock(void)
 	PRINT_FORMAT(" Average time to lock the mutex %u tcs = %u nsec",
 		     timestamp / N_TEST_MUTEX,
 		     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp, N_TEST_MUTEX));
+	TC_METRIC("mutex_lock", timestamp / N_TEST_MUTEX, "cycles");
 	timestamp = TIME_STAMP_DELTA_GET(0);
 	for (i = 0; i < N_TEST_MUTEX; i++) {
 		k_mutex_unlock(&TEST_MUTEX);
@@ -113,5 +117,6 @@ int mutex_lock_unlock(void)
 	PRINT_FORMAT(" Average time to unlock the mutex %u tcs = %u nsec",
 		     timestamp / N_TEST_MUTEX,
 		     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp, N_TEST_MUTEX));
+	TC_METRIC("mutex_unlock", timestamp / N_TEST_MUTEX, "cycles");
 	return 0;
 }
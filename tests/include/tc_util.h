@@ -80,6 +80,26 @@
 #define TC_END_RESULT(result)                           \
 	_TC_END_RESULT((result), __func__)
 
+/**
+ * @def TC_METRIC
+ * @brief Report a numerical result of the test, such as a latency
+ *
+ * Prints ``METRIC <name>=<value> unit=<unit>``. sanitycheck records these
+ * in its reports and warns when a value gets worse compared to a previous
+ * run. Lower values are considered better, use TC_METRIC_HIGHER_BETTER for
+ * results like a throughput.
+ *
+ * @param name String literal naming the result, without spaces
+ * @param value Unsigned integer value
+ * @param unit String literal with the unit of the value, without spaces
+ */
+#define TC_METRIC(name, value, unit)					\
+	PRINT_DATA("METRIC " name "=%u unit=" unit "\n", (unsigned int)(value))
+
+#define TC_METRIC_HIGHER_BETTER(name, value, unit)			\
+	PRINT_DATA("METRIC " name "=%u unit=" unit " better=higher\n",	\
+		   (unsigned int)(value))
+
 #define TC_END_REPORT(result)                               \
 	do {                                                    \
 		PRINT_LINE;                                         \